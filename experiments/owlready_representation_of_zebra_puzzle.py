@@ -4,169 +4,360 @@ This file serves as a preparation to implement the yaml-parser. It finally shoul
 is loaded to set up all the individuals, classes and roles and then restrictions should be added manually.
 """
 
-from ipydex import IPS
+import os
+import json
+import argparse
+import shelve
+import hashlib
+import functools
+import sqlite3
 
 import yamlpyowl as ypo2
 
 
-world = ypo2.owl2.World()
-fpath = "../examples/einsteins_zebra_riddle.owl.yaml"
-om = ypo2.OntologyManager(fpath, world)
+fpath = "../examples/einsteins_zebra_riddle.owl.yml"
 owl2 = ypo2.owl2
 
-assert om.iri == "https://w3id.org/yet/undefined/einstein-zebra-puzzle-ontology#"
+ONTO_IRI = "https://w3id.org/yet/undefined/einstein-zebra-puzzle-ontology#"
 
-# define `n` as shortcut to quickly access all entities (individuals, classes, roles)
-n = om.n
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "yamlpyowl")
 
-# some basic assertion to test whether the ontology has been loaded from the yaml-file as expected
+# inferred property values are cached here (keyed by the restrictions which were added before reasoning)
+REASONER_CACHE_PATH = os.path.join(CACHE_DIR, "zebra_puzzle_reasoner_cache")
 
+# restrictions which caused an inconsistency in a previous debug run are stored here
+CONFLICT_CACHE_PATH = os.path.join(CACHE_DIR, "zebra_puzzle_conflicts.json")
 
-assert n.house_2.right_to == n.house_1
-assert n.house_1.right_to == ypo2.owl2.Nothing
-assert n.house_5.left_to == ypo2.owl2.Nothing
+parser = argparse.ArgumentParser(description="Solve the zebra puzzle by adding restrictions to the yaml-ontology.")
+parser.add_argument(
+    "--debug", action="store_true", help="add the restrictions one by one (with reasoning) to find a contradiction"
+)
+parser.add_argument(
+    "--interactive",
+    action="store_true",
+    help="start an interactive shell at the end (alternatively: set the environment variable YPO_INTERACTIVE)",
+)
+parser.add_argument("--backend", default="pellet", choices=list(ypo2.reasoner_backends), help="reasoner backend")
+args = parser.parse_args()
 
-# this is only true after the reasoner has run
-assert n.Pet not in n.dog.is_a
+debug = args.debug
 
-om.sync_reasoner(infer_property_values=True)
 
-assert n.Pet in n.dog.is_a
+def get_world_cache_path():
+    """
+    The reasoned world depends on the yaml-file, the yamlpyowl version and the restrictions (defined in this file).
 
+    :return:    path of the sqlite3 file which stores the final (reasoned) world
+    """
+    h = hashlib.blake2b(ypo2.__version__.encode())
+    h.update(args.backend.encode())
+    for path in (fpath, __file__):
+        with open(path, "rb") as src_file:
+            h.update(src_file.read())
+    return os.path.join(CACHE_DIR, f"{h.hexdigest()}.sqlite3")
 
-# Now these facts have to be represented:
 
-# 1. There are five houses.
-# 2. The Englishman lives in the red house.
-# 3. The Spaniard owns the dog.
-# 4. Coffee is drunk in the green house.
-# 5. The Ukrainian drinks tea.
-# 6. The green house is immediately to the right of the ivory house.
-# 7. The Old Gold smoker owns snails.
-# 8. Kools are smoked in the yellow house.
-# 9. Milk is drunk in the middle house.
-# 10. The Norwegian lives in the first house.
-# 11. The man who smokes Chesterfields lives in the house next to the man with the fox.
-# 12. Kools are smoked in a house next to the house where the horse is kept.
-# 13. The Lucky Strike smoker drinks orange juice.
-# 14. The Japanese smokes Parliaments.
-# 15. The Norwegian lives next to the blue house.
+def save_world(world, path):
+    """
+    Write a snapshot of the quadstore of `world` to `path` (atomically, i.e. via a temporary file).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    target_db = sqlite3.connect(tmp_path)
+    world.graph.db.backup(target_db)
+    target_db.close()
+    os.replace(tmp_path, path)
 
 
-# Now step by step
+world_cache_path = get_world_cache_path()
 
+# in debug mode the world contains additional restrictions -> do not use the cache
+world_is_cached = not debug and os.path.isfile(world_cache_path)
 
-owl2.AllDifferent(list(om.onto.individuals()))
+if world_is_cached:
+    # restrictions have already been added and the reasoner has already run -> only load the result
+    world = owl2.World(filename=world_cache_path)
+    om = None
+    n = world.get_ontology(ONTO_IRI)
+else:
+    om = ypo2.OntologyManager.from_yaml_cached(fpath)
+    world = om.world
 
-restriction_tuples = []
+    assert om.iri == ONTO_IRI
 
+    # define `n` as shortcut to quickly access all entities (individuals, classes, roles)
+    n = om.n
 
-# this comes handy for debugging:
-# noinspection PyShadowingNames
-def append_restriction_tuple(restr, indiv):
-    restriction_tuples.append((restr, indiv))
+    # some basic assertion to test whether the ontology has been loaded from the yaml-file as expected
 
+    assert n.house_2.right_to == n.house_1
+    assert n.house_1.right_to == ypo2.owl2.Nothing
+    assert n.house_5.left_to == ypo2.owl2.Nothing
 
-# there are some implicit facts which have to be added:
+    # this is only true after the reasoner has run
+    assert n.Pet not in n.dog.is_a
 
-append_restriction_tuple(n.owns.some(n.Pet), n.Man)
-append_restriction_tuple(n.drinks.some(n.Beverage), n.Man)
-append_restriction_tuple(n.lives_in.some(n.House), n.Man)
-append_restriction_tuple(n.has_color.some(n.Color), n.House)
+    om.sync_reasoner(backend=args.backend, infer_property_values=True)
 
+    assert n.Pet in n.dog.is_a
 
-# 1. There are five houses.
-# already fulfilled by construction
 
-# 2. The Englishman lives in the red house.
-append_restriction_tuple(n.lives_in.some(n.has_color.value(n.red)), n.Englishman)
+# Now these facts have to be represented:
 
+# 1. There are five houses.
+# 2. The Englishman lives in the red house.
 # 3. The Spaniard owns the dog.
-append_restriction_tuple(n.owns.value(n.dog), n.Spaniard)
-
 # 4. Coffee is drunk in the green house.
-append_restriction_tuple(n.Inverse(n.drinks).some(n.lives_in.some(n.has_color.value(n.green))), n.coffee)
-
 # 5. The Ukrainian drinks tea.
-append_restriction_tuple(n.drinks.value(n.tea), n.Ukrainian)
-
 # 6. The green house is immediately to the right of the ivory house.
-append_restriction_tuple(n.Inverse(n.has_color).some(n.right_to.some(n.has_color.value(n.ivory))), n.green)
-
 # 7. The Old Gold smoker owns snails.
-append_restriction_tuple(n.Inverse(n.smokes).some(n.owns.value(n.snails)), n.Old_Gold)
-
 # 8. Kools are smoked in the yellow house.
-append_restriction_tuple(n.Inverse(n.smokes).some(n.lives_in.some(n.has_color.value(n.yellow))), n.Kools)
-
 # 9. Milk is drunk in the middle house.
-append_restriction_tuple(n.Inverse(n.drinks).some(n.lives_in.value(n.house_3)), n.milk)
-
 # 10. The Norwegian lives in the first house.
-append_restriction_tuple(n.lives_in.value(n.house_1), n.Norwegian)
-
-
 # 11. The man who smokes Chesterfields lives in the house next to the man with the fox.
-# right_to ist additional information
-append_restriction_tuple(
-    n.Inverse(n.smokes).some(n.lives_in.some(n.right_to.some(n.Inverse(n.lives_in).some(n.owns.value(n.fox))))),
-    n.Chesterfields,
-)
+# 12. Kools are smoked in a house next to the house where the horse is kept.
+# 13. The Lucky Strike smoker drinks orange juice.
+# 14. The Japanese smokes Parliaments.
+# 15. The Norwegian lives next to the blue house.
 
 
-# 12. Kools are smoked in a house next to the house where the horse is kept.
-# left_to ist additional information
-append_restriction_tuple(
-    n.Inverse(n.smokes).some(n.lives_in.some(n.left_to.some(n.Inverse(n.lives_in).some(n.owns.value(n.horse))))),
-    n.Kools,
-)
+# Now step by step
 
-# 13. The Lucky Strike smoker drinks orange juice.
-append_restriction_tuple(n.Inverse(n.smokes).some(n.drinks.value(n.orange_juice)), n.Lucky_Strike)
 
-# 14. The Japanese smokes Parliaments.
-append_restriction_tuple(n.smokes.value(n.Parliaments), n.Japanese)
+# `Inverse(smokes)` etc. occur several times -> create each of these objects only once
+# (owlready2 copies a construct if it is already used elsewhere)
+_inverse = functools.lru_cache(maxsize=None)(owl2.Inverse)
+
+
+# all (restriction, individual)-pairs are created once here and then only iterated
+RESTRICTIONS = (
+    # there are some implicit facts which have to be added:
+    (n.owns.some(n.Pet), n.Man),
+    (n.drinks.some(n.Beverage), n.Man),
+    (n.lives_in.some(n.House), n.Man),
+    (n.has_color.some(n.Color), n.House),
+    # 1. There are five houses.
+    # already fulfilled by construction
+    # 2. The Englishman lives in the red house.
+    (n.lives_in.some(n.has_color.value(n.red)), n.Englishman),
+    # 3. The Spaniard owns the dog.
+    (n.owns.value(n.dog), n.Spaniard),
+    # 4. Coffee is drunk in the green house.
+    (_inverse(n.drinks).some(n.lives_in.some(n.has_color.value(n.green))), n.coffee),
+    # 5. The Ukrainian drinks tea.
+    (n.drinks.value(n.tea), n.Ukrainian),
+    # 6. The green house is immediately to the right of the ivory house.
+    (_inverse(n.has_color).some(n.right_to.some(n.has_color.value(n.ivory))), n.green),
+    # 7. The Old Gold smoker owns snails.
+    (_inverse(n.smokes).some(n.owns.value(n.snails)), n.Old_Gold),
+    # 8. Kools are smoked in the yellow house.
+    (_inverse(n.smokes).some(n.lives_in.some(n.has_color.value(n.yellow))), n.Kools),
+    # 9. Milk is drunk in the middle house.
+    (_inverse(n.drinks).some(n.lives_in.value(n.house_3)), n.milk),
+    # 10. The Norwegian lives in the first house.
+    (n.lives_in.value(n.house_1), n.Norwegian),
+    # 11. The man who smokes Chesterfields lives in the house next to the man with the fox.
+    # right_to ist additional information
+    (
+        _inverse(n.smokes).some(n.lives_in.some(n.right_to.some(_inverse(n.lives_in).some(n.owns.value(n.fox))))),
+        n.Chesterfields,
+    ),
+    # 12. Kools are smoked in a house next to the house where the horse is kept.
+    # left_to ist additional information
+    (
+        _inverse(n.smokes).some(n.lives_in.some(n.left_to.some(_inverse(n.lives_in).some(n.owns.value(n.horse))))),
+        n.Kools,
+    ),
+    # 13. The Lucky Strike smoker drinks orange juice.
+    (_inverse(n.smokes).some(n.drinks.value(n.orange_juice)), n.Lucky_Strike),
+    # 14. The Japanese smokes Parliaments.
+    (n.smokes.value(n.Parliaments), n.Japanese),
+    # 15. The Norwegian lives next to the blue house.
+    # !! "left_to" is additional knowledge
+    (n.lives_in.some(n.left_to.some(n.has_color.value(n.blue))), n.Norwegian),
+)
 
-# 15. The Norwegian lives next to the blue house.
-# !! "left_to" is additional knowledge
-append_restriction_tuple(n.lives_in.some(n.left_to.some(n.has_color.value(n.blue))), n.Norwegian)
+# deterministic value-restrictions (e.g. Norwegian lives_in house_1) pin down the solution while some-restrictions
+# introduce choices for the reasoner -> add the former first (`sorted` is stable: order of the facts is kept otherwise)
+restriction_tuples = sorted(RESTRICTIONS, key=lambda rt: getattr(rt[0], "type", None) != owl2.VALUE)
+
+
+def get_restriction_str(restriction_tuple):
+    """
+    :param restriction_tuple:   (restriction, individual)-pair
+    :return:                    str like "lives_in.value(house_1) -> Norwegian"
+    """
+    restr, indiv = restriction_tuple
+    return f"{restr!r} -> {indiv.name}"
+
+
+def load_conflicts():
+    """
+    :return:    set of restriction strs which caused an inconsistency in previous debug runs
+    """
+    if not os.path.isfile(CONFLICT_CACHE_PATH):
+        return set()
+    with open(CONFLICT_CACHE_PATH) as conflict_file:
+        return set(json.load(conflict_file))
+
+
+def save_conflict(restriction_tuple):
+    """
+    Store the restriction which made the ontology inconsistent such that it is tried first in the next debug run.
+
+    :param restriction_tuple:   (restriction, individual)-pair
+    """
+    conflicts = load_conflicts()
+    conflicts.add(get_restriction_str(restriction_tuple))
+    os.makedirs(os.path.dirname(CONFLICT_CACHE_PATH), exist_ok=True)
+    with open(CONFLICT_CACHE_PATH, "w") as conflict_file:
+        json.dump(sorted(conflicts), conflict_file, indent=2)
+
+
+@functools.lru_cache(maxsize=None)
+def get_source_digest():
+    """
+    Hash the ontology source, the yamlpyowl version and the reasoner backend (the yaml-file is read only once).
+
+    :return:    digest (bytes)
+    """
+
+    with open(fpath, "rb") as yaml_file:
+        h = hashlib.blake2b(yaml_file.read())
+    h.update(ypo2.__version__.encode())
+    h.update(args.backend.encode())
+    return h.digest()
+
+
+def get_restriction_set_key(restriction_tuples):
+    """
+    Create a hash which identifies the ontology source (see `get_source_digest`) and the complete (unordered) set of
+    added restrictions.
+
+    :param restriction_tuples:  sequence of (restriction, individual)-pairs
+    :return:                    hex digest (str)
+    """
+
+    restriction_strs = sorted(set(map(get_restriction_str, restriction_tuples)))
+    h = hashlib.blake2b(get_source_digest())
+    h.update("\n".join(restriction_strs).encode())
+    return h.hexdigest()
+
+
+def get_property_values():
+    """
+    :return:    dict like {("Norwegian", "lives_in"): ["house_1"], ...}
+    """
+    res = {}
+    for indiv in om.onto.individuals():
+        for prop in indiv.get_properties():
+            if isinstance(prop, owl2.ObjectPropertyClass):
+                res[(indiv.name, prop.name)] = [value.name for value in prop[indiv]]
+    return res
+
+
+def apply_property_values(property_values):
+    """
+    Re-apply cached (inferred) property values to the current world. Unknown names (like owl:Nothing) are skipped.
+
+    :param property_values:     dict like returned by get_property_values()
+    """
+    for (indiv_name, prop_name), value_names in property_values.items():
+        indiv = om.name_mapping[indiv_name]
+        prop = om.name_mapping[prop_name]
+        current_values = prop[indiv]
+        for value_name in value_names:
+            value = om.name_mapping.get(value_name)
+            if value is None or value in current_values:
+                continue
+            if issubclass(prop, owl2.FunctionalProperty):
+                setattr(indiv, prop.name, value)
+            else:
+                getattr(indiv, prop.name).append(value)
+
+
+def cached_sync_reasoner(restriction_tuples):
+    """
+    Call the reasoner only if the inferred property values for this set of restrictions are not yet known.
+
+    :param restriction_tuples:  sequence of (restriction, individual)-pairs which have been added so far
+    """
+
+    os.makedirs(os.path.dirname(REASONER_CACHE_PATH), exist_ok=True)
+    key = get_restriction_set_key(restriction_tuples)
+    with shelve.open(REASONER_CACHE_PATH) as shelf:
+        if key in shelf:
+            apply_property_values(shelf[key])
+            return
+
+        # note: this raises an exception if the ontology is inconsistent (-> nothing is cached)
+        om.sync_reasoner(backend=args.backend, infer_property_values=True)
+        shelf[key] = get_property_values()
 
 
-debug = False
 # debug:
 # add some true facts and find the restriction which contradicts to these
+debug_restriction_tuples = []
 if debug:
-    om.add_restriction_to_entity(n.owns.value(n.zebra), n.Japanese)
-    om.add_restriction_to_entity(n.has_color.value(n.blue), n.house_2)
-    om.add_restriction_to_entity(n.lives_in.value(n.house_2), n.Ukrainian)
-    om.add_restriction_to_entity(n.has_color.value(n.green), n.house_5)
-
-# debug: where does the contradiction occur:
-for i, (restr, indiv) in enumerate(restriction_tuples):
-    print(f"\n\n{i+2}\n")
-    om.add_restriction_to_entity(restr, indiv)
-    if debug:
-        om.sync_reasoner(infer_property_values=True)
-
-om.sync_reasoner(infer_property_values=True)
+    debug_restriction_tuples = [
+        (n.owns.value(n.zebra), n.Japanese),
+        (n.has_color.value(n.blue), n.house_2),
+        (n.lives_in.value(n.house_2), n.Ukrainian),
+        (n.has_color.value(n.green), n.house_5),
+    ]
+    for restr, indiv in debug_restriction_tuples:
+        om.add_restriction_to_entity(restr, indiv)
+
+if world_is_cached:
+    pass
+elif debug:
+    om.assert_all_different()
+
+    # restrictions which were involved in a contradiction before are added first (-> early failure on re-run)
+    known_conflicts = load_conflicts()
+    restriction_tuples.sort(key=lambda rt: get_restriction_str(rt) not in known_conflicts)
+
+    # debug: where does the contradiction occur:
+    for i, (restr, indiv) in enumerate(restriction_tuples):
+        print(f"\n\n{i}: {restr} -> {indiv.name}\n")
+        om.add_restriction_to_entity(restr, indiv)
+        try:
+            cached_sync_reasoner(debug_restriction_tuples + restriction_tuples[: i + 1])
+        except owl2.OwlReadyInconsistentOntologyError:
+            save_conflict((restr, indiv))
+            raise
+else:
+    # add all restrictions (and the AllDifferent-axiom) within one ontology context
+    with om.onto:
+        om.assert_all_different()
+        om.add_restrictions_to_entities(restriction_tuples)
+
+    # (in debug mode the last call of `cached_sync_reasoner` already covered all restrictions)
+    om.sync_reasoner(backend=args.backend, infer_property_values=True)
+    save_world(world, world_cache_path)
 
 
 # this should finally run:
 
-task_complete = True
-if task_complete:
-    om.sync_reasoner(infer_property_values=True)
-
-    assert n.Spaniard.owns == n.dog
-    assert n.Englishman.owns == n.snails
-    assert n.Japanese.owns == n.zebra
-    assert n.Norwegian.owns == n.fox
-    assert n.Ukrainian.owns == n.horse
+# person: (house, pet)
+EXPECTED_SOLUTION = {
+    "Norwegian": ("house_1", "fox"),
+    "Ukrainian": ("house_2", "horse"),
+    "Englishman": ("house_3", "snails"),
+    "Spaniard": ("house_4", "dog"),
+    "Japanese": ("house_5", "zebra"),
+}
+
+# retrieve the (inferred) solution with one query instead of accessing the properties individually
+query = f"""
+    PREFIX z: <{ONTO_IRI}>
+    SELECT ?person ?house ?pet WHERE {{ ?person z:lives_in ?house . ?person z:owns ?pet . }}
+"""
+solution = {person.name: (house.name, pet.name) for person, house, pet in world.sparql(query)}
+assert solution == EXPECTED_SOLUTION, solution
 
-    assert n.Norwegian.lives_in == n.house_1
-    assert n.Englishman.lives_in == n.house_3
-    assert n.Japanese.lives_in == n.house_5
-    assert n.Ukrainian.lives_in == n.house_2
-    assert n.Spaniard.lives_in == n.house_4
+if args.interactive or os.environ.get("YPO_INTERACTIVE"):
+    # import only here to keep the startup of non-interactive runs fast
+    from ipydex import IPS
 
-IPS()  # start interactive shell in namespace (should be run in a terminal window, not inside pycharm, spyder, ...)
+    IPS()  # start interactive shell in namespace (should be run in a terminal window, not inside pycharm, spyder, ...)
@@ -3,8 +3,8 @@
 
 import sys
 import os
-import setuptools
-from setuptools import setup, find_packages
+import re
+from setuptools import setup
 
 
 packagename = "yamlpyowl"
@@ -12,20 +12,27 @@ packagename = "yamlpyowl"
 # consider the path of `setup.py` as root directory:
 PROJECTROOT = os.path.dirname(sys.argv[0]) or "."
 
-release_path = os.path.join(PROJECTROOT, "src", packagename, "release.py")
-with open(release_path, encoding="utf8") as release_file:
-    __version__ = release_file.read().split('__version__ = "', 1)[1].split('"', 1)[0]
 
+def _read_version():
+    release_path = os.path.join(PROJECTROOT, "src", packagename, "release.py")
+    with open(release_path, encoding="utf8") as release_file:
+        return re.search(r'__version__\s*=\s*"([^"]+)"', release_file.read()).group(1)
 
-with open("requirements.txt") as requirements_file:
-    requirements = requirements_file.read()
+
+__version__ = _read_version()
+
+
+with open(os.path.join(PROJECTROOT, "requirements.txt")) as requirements_file:
+    # drop empty lines and comments
+    requirements = [line.strip() for line in requirements_file if line.strip() and not line.startswith("#")]
 
 setup(
     name=packagename,
     version=__version__,
     author="Carsten Knoll",
     author_email="Carsten.Knoll@tu-dresden.de",
-    packages=find_packages("src"),
+    # explicit list (instead of find_packages) -> no need to scan the source tree
+    packages=[packagename],
     package_dir={"": "src"},
     url="https://github.com/cknoll/yamlpyowl",
     license="GPLv3",
@@ -1,10 +1,68 @@
 # -*- coding: utf-8 -*-
 
-try:
-    from .core import *
-except ImportError:
-    # this might be relevant during the installation process
-    # otherwise setup.py cannot be executed
-    pass
+import importlib
 
 from .release import __version__
+
+# public names of the `core` module (they are imported lazily, see `__getattr__`)
+__all__ = [
+    "__version__",
+    "owl2",
+    "OntologyManager",
+    "Container",
+    "NameMapping",
+    "OntoContainer",
+    "Lit",
+    "UnknownEntityError",
+    "MissingKeywordError",
+    "TreeParseFunction",
+    "PropertyRestrictionParser",
+    "reasoner_backends",
+    "logic_functions",
+    "restriction_types",
+    "basic_types",
+    "Yaml_Atom",
+    "Yaml_Value",
+    "ScalarClassExpression",
+    "ClassExpression",
+    "load_yaml_file",
+    "check_type",
+    "check_dict_type",
+    "check_list_type",
+    "test_type",
+    "ensure_list",
+    "unpack_len1_mapping",
+    "create_property",
+    "is_generalized_thing",
+]
+
+
+def __getattr__(name):
+    """
+    Import the `core` module (and thus owlready2, pydantic, ...) only when one of its names is accessed for the first
+    time (PEP 562). This keeps `import yamlpyowl` cheap (and works during the installation process where the
+    dependencies might not yet be available).
+    """
+
+    if name == "core":
+        # (after the import the submodule is set as attribute by the import system)
+        return importlib.import_module(".core", __name__)
+
+    if name.startswith("_"):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    core = importlib.import_module(".core", __name__)
+
+    try:
+        value = getattr(core, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    # store the name in the package namespace -> later accesses do not call this function again
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    # based on `__all__` -> `dir(yamlpyowl)` does not trigger the import of `core`
+    return sorted(set(globals()) | set(__all__))
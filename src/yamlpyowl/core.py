@@ -1,9 +1,11 @@
 import os
 import re
 import json
+import weakref
+import functools
 import yaml
 import pydantic
-from typing import Union, List, Dict, Any, Tuple
+from typing import Union, List, Dict, Any, Tuple, get_origin, get_args
 from dataclasses import dataclass
 from collections import defaultdict
 
@@ -43,6 +45,29 @@ Yaml_Atom = Union[str, int, float]
 Yaml_Value = Union[str, int, float, list, dict]
 basic_types = (int, float, str)
 
+# reasoners which are shipped with owlready2; note: hermit does not support `infer_data_property_values`
+reasoner_backends = {
+    "pellet": sync_reasoner_pellet,
+    "hermit": owl2.sync_reasoner_hermit,
+}
+
+
+# use the fast libyaml-based loader if available
+yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# these are compiled only once (at import time)
+# will match '"some string"' and "'some string'"
+quoted_string_re = re.compile("^(?:\".*\"|'.*')$")
+
+# will match "bfo:SomeClass"
+ns_compositum_re = re.compile("^.+:.+$")
+
+# sentinel to distinguish "not found" from a cached value of None
+_MISSING = object()
+
+# this dict will hold mappings like {<abspath>: (<mtime>, <raw_data>)} (see OntologyManager.from_yaml_cached)
+_yaml_data_cache = {}
+
 
 class UnknownEntityError(ValueError):
     pass
@@ -53,20 +78,81 @@ class MissingKeywordError(ValueError):
 
 
 class Container(object):
-    def __init__(self, arg=None, **data_dict):
-        if isinstance(arg, dict) and not data_dict:
-            data_dict = arg
+    def __init__(self, **data_dict):
         self.__dict__.update(data_dict)
 
+    @classmethod
+    def from_dict(cls, data_dict: dict) -> "Container":
+        """
+        Create a container from a dict (whose keys need not to be valid python names)
+        """
+        res = cls()
+        res.__dict__.update(data_dict)
+        return res
+
     def __repr__(self):
         return f"<Container (len={len(self.__dict__)})>"
 
 
-class OntoContainer(Container):
-    def __init__(self, container_name):
-        super().__init__(self)
+class NameMapping(dict):
+    """
+    dict which reports the keys which are changed. This allows to invalidate caches which depend on its content.
+    """
+
+    def __init__(self, *args, key_changed_callback: callable = None, **kwargs):
+        """
+        :param key_changed_callback:    callable which is called with the changed key (or with `None` if possibly
+                                        all keys have changed)
+        """
+        super().__init__(*args, **kwargs)
+        self.key_changed_callback = key_changed_callback
+
+    def _key_changed(self, key):
+        if self.key_changed_callback is not None:
+            self.key_changed_callback(key)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._key_changed(key)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._key_changed(key)
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._key_changed(None)
+
+    def setdefault(self, key, default=None):
+        self._key_changed(key)
+        return super().setdefault(key, default)
+
+    def pop(self, key, *args):
+        self._key_changed(key)
+        return super().pop(key, *args)
+
+    def popitem(self):
+        self._key_changed(None)
+        return super().popitem()
+
+    def clear(self):
+        super().clear()
+        self._key_changed(None)
+
+
+class OntoContainer(object):
+    """
+    Lightweight container for parsed data (see `OntologyManager.containerFactoryFactory`)
+    """
+
+    __slots__ = ("name", "data")
+
+    def __init__(self, container_name, data=None):
         self.name = container_name
-        self.data = None
+        self.data = data
+
+    def __repr__(self):
+        return f"<OntoContainer {self.name}>"
 
 # This encapsulates an expression which can be used in resstrictions for SubClassOf or EquivalentTo
 ScalarClassExpression = Union[owl2.ThingClass, owl2.class_construct.Construct]
@@ -80,6 +166,19 @@ class Lit:
     some: str = "some"  # !introduce typing.Final (after dropping 3.7 support)
 
 
+# these mappings are the same for every OntologyManager (and are not modified)
+logic_functions = {
+    "Or": owl2.Or,
+    "And": owl2.And,
+    "Not": owl2.Not,
+}
+
+restriction_types = {
+    "some": Lit.some,
+    "value": Lit.value,
+}
+
+
 def identity_func(x):
     return x
 
@@ -101,17 +200,40 @@ def is_generalized_thing(obj):
 
 
 class OntologyManager(object):
-    def __init__(self, fpath, world=None):
-        """
-
-        :param fpath:   path of the yaml-file containing the ontology
-        :param world:   owl2 world object holding all the RDF-data (default: None)
+    # keyword -> name of the method which handles a top level yaml-dict with this keyword
+    top_level_parse_function_names = {
+        "import": "process_import",
+        "annotation": "process_global_annotation",
+        "owl_individual": "make_individual_from_dict",
+        "owl_multiple_individuals": "make_multiple_individuals_from_dict",
+        "owl_class": "make_class_from_dict",
+        "multiple_owl_classes": "make_multiple_classes_from_list",
+        "owl_object_property": "make_object_property_from_dict",
+        "owl_data_property": "make_data_property_from_dict",
+        "owl_inverse_property": "make_inverse_property_from_dict",
+        "property_facts": "make_property_facts_from_dict",
+        "relation_concept_facts": "make_relation_concept_facts_from_dict",
+        "restriction": "add_restriction_from_dict",
+        "axiom_equivalent_to": "add_axiom_equivalent_to",
+        "swrl_rule": "add_swrl_rule_from_dict",
+        "different_individuals": "different_individuals",
+    }
+
+    def __init__(self, fpath, world=None, raw_data=None):
+        """
+
+        :param fpath:       path of the yaml-file containing the ontology
+        :param world:       owl2 world object holding all the RDF-data (default: None)
+        :param raw_data:    optional list of dicts as returned by `load_yaml_file(fpath)`; if passed the file is not
+                            read again (useful to create the same ontology in different worlds). The data is not
+                            changed by this class.
         """
         if world is None:
             world = owl2.default_world
 
         self.world = world
         self.raw_data = None
+        self._merged_raw_data = None  # union of all dicts in self.raw_data (see _get_from_all_dicts)
         self.new_python_classes = []
         self.concepts = []
         self.roles = {}
@@ -132,44 +254,35 @@ class OntologyManager(object):
         self._RelationConcept = None
         self._RelationConcept_generic_main_role = None  # all other RC_main_roles will be a subclass of this
         self.relation_concept_main_roles = []  # list of all subclasses of self._Relation_Concept
-        self.auto_generated_name_numbers = defaultdict(lambda: 0)
+        self.auto_generated_name_numbers = defaultdict(int)
+
+        # {<property>: <bool>} see `_is_functional_property`
+        self._functional_property_cache = {}
 
-        # we cannot store arbitrary python attributes in owl-objects directly, hence we use this dict
-        # keys will be tuples of the form: (obj, <attribute_name_as_str>)
-        self.custom_attribute_store = {}
+        # created on demand (see `make_query`)
+        self._rdflib_graph = None
+
+        # we cannot store arbitrary python attributes in owl-objects directly, hence we use this two-level dict
+        # structure: {obj: {<attribute_name_as_str>: value}} (entries vanish when obj is garbage collected)
+        self.custom_attribute_store = weakref.WeakKeyDictionary()
 
         # will be a Container later for quick access to the names of the ontology
         self.n = self.name_mapping_container = None
-        self.quoted_string_re = re.compile("(^\".*\"$)|(^'.*'$)")
-
-        # will match "bfo:SomeClass"
-        self.ns_compositum_re = re.compile("(^.+:.+$)")
+        self.quoted_string_re = quoted_string_re
+        self.ns_compositum_re = ns_compositum_re
 
-        self._load_yaml(fpath)
+        if raw_data is None:
+            self._load_yaml(fpath)
+        else:
+            assert check_list_type(raw_data, dict)
+            self.raw_data = raw_data
 
         # extract the internationalized resource identifier or use default
         self.iri = self._get_from_all_dicts("iri", "https://w3id.org/yet/undefined/ontology#")
         self.onto = self.world.get_ontology(self.iri)
 
-        self.name_mapping = {
-            "owl:Thing": Thing,
-            "owl:Nothing": owl2.Nothing,
-            "Functional": FunctionalProperty,
-            "InverseFunctional": owl2.InverseFunctionalProperty,
-            "Symmetric": SymmetricProperty,
-            "Transitive": TransitiveProperty,
-            "Inverse": owl2.Inverse,
-            "int": int,
-            "float": float,
-            "str": str,
-            "bool": bool,
-        }
-
-        self.logic_functions = {
-            "Or": owl2.Or,
-            "And": owl2.And,
-            "Not": owl2.Not,
-        }
+        self.logic_functions = logic_functions
+        self.restriction_types = restriction_types
 
         # classexpression constructors
         self.ce_constructors = {
@@ -177,31 +290,33 @@ class OntologyManager(object):
             "OneOf": owl2.OneOf,
         }
 
-        self.name_mapping.update(self.logic_functions)
+        # cache for `resolve_name`; keys: (name, accept_unquoted_strs)
+        self._resolve_cache = {}
 
-        self.restriction_types = {
-            "some": Lit.some,
-            "value": Lit.value,
-        }
-        self.name_mapping.update(self.restriction_types)
+        self.name_mapping = NameMapping(
+            {
+                "owl:Thing": Thing,
+                "owl:Nothing": owl2.Nothing,
+                "Functional": FunctionalProperty,
+                "InverseFunctional": owl2.InverseFunctionalProperty,
+                "Symmetric": SymmetricProperty,
+                "Transitive": TransitiveProperty,
+                "Inverse": owl2.Inverse,
+                "int": int,
+                "float": float,
+                "str": str,
+                "bool": bool,
+                **self.logic_functions,
+                **self.restriction_types,
+            },
+            key_changed_callback=self._invalidate_resolve_cache,
+        )
 
+        # bind the top level parse functions to this instance
         self.top_level_parse_functions = {}
+        for name, method_name in self.top_level_parse_function_names.items():
+            self.create_tl_parse_function(name, getattr(self, method_name))
         self.normal_parse_functions = {}
-        self.create_tl_parse_function("import", self.process_import)
-        self.create_tl_parse_function("annotation", self.process_global_annotation)
-        self.create_tl_parse_function("owl_individual", self.make_individual_from_dict)
-        self.create_tl_parse_function("owl_multiple_individuals", self.make_multiple_individuals_from_dict)
-        self.create_tl_parse_function("owl_class", self.make_class_from_dict)
-        self.create_tl_parse_function("multiple_owl_classes", self.make_multiple_classes_from_list)
-        self.create_tl_parse_function("owl_object_property", self.make_object_property_from_dict)
-        self.create_tl_parse_function("owl_data_property", self.make_data_property_from_dict)
-        self.create_tl_parse_function("owl_inverse_property", self.make_inverse_property_from_dict)
-        self.create_tl_parse_function("property_facts", self.make_property_facts_from_dict)
-        self.create_tl_parse_function("relation_concept_facts", self.make_relation_concept_facts_from_dict)
-        self.create_tl_parse_function("restriction", self.add_restriction_from_dict)
-        self.create_tl_parse_function("axiom_equivalent_to", self.add_axiom_equivalent_to)
-        self.create_tl_parse_function("swrl_rule", self.add_swrl_rule_from_dict)
-        self.create_tl_parse_function("different_individuals", self.different_individuals)
 
         self.create_nm_parse_function("types")
         self.create_nm_parse_function("EquivalentTo", do_nothing=True, start_ips=False)  # this leaves the respective dict unchanged
@@ -236,6 +351,27 @@ class OntologyManager(object):
 
         self.load_ontology()
 
+    @classmethod
+    def from_yaml_cached(cls, fpath):
+        """
+        Return a new OntologyManager (with its own world) for the given yaml-file. The parsed yaml data is cached,
+        i.e. repeated calls for an unchanged file do not parse the file again (the entities are created every time).
+
+        :param fpath:   path of the yaml-file containing the ontology
+        :return:        OntologyManager instance
+        """
+
+        abspath = os.path.abspath(fpath)
+        mtime = os.path.getmtime(abspath)
+        cached_mtime, raw_data = _yaml_data_cache.get(abspath, (None, None))
+        if cached_mtime != mtime:
+            raw_data = load_yaml_file(abspath)
+            # only the latest version of each file is kept
+            _yaml_data_cache[abspath] = (mtime, raw_data)
+
+        # the raw data is not changed by the constructor -> it can be shared
+        return cls(fpath, world=owl2.World(), raw_data=raw_data)
+
     # noinspection PyPep8Naming
     @staticmethod
     def atom_or_And(arg: list):
@@ -288,18 +424,24 @@ class OntologyManager(object):
         :param data_dict:
         :return:
         """
-        check_type(data_dict, Dict[str, Union[str, list, int, float]])
+        assert check_dict_type(data_dict, str, (str, list, int, float))
 
         # assert len(data_dict) == 1
         # raw_key, raw_value = list(data_dict.items())[0]
         res = {}
+        resolve_str = self._resolve_str
+        resolve_name = self.resolve_name
         for raw_key, raw_value in data_dict.items():
-            key = self.resolve_name(raw_key)
+            # keys are guaranteed to be strings due to the type check above
+            key = resolve_str(raw_key, False)
 
             if isinstance(raw_value, str):
-                value = self.resolve_name(raw_value, accept_unquoted_strs=True)
+                value = resolve_str(raw_value, True)
             elif isinstance(raw_value, list):
-                value = [self.resolve_name(elt, accept_unquoted_strs=True) for elt in raw_value]
+                value = [
+                    resolve_str(elt, True) if isinstance(elt, str) else resolve_name(elt, accept_unquoted_strs=True)
+                    for elt in raw_value
+                ]
             elif isinstance(raw_value, (float, int)):
                 value = raw_value
             else:
@@ -336,8 +478,6 @@ class OntologyManager(object):
 
         def outer_func(arg: list) -> OntoContainer:
 
-            res = OntoContainer(container_name)
-
             if start_ips:
                 # start ipython embedded shell
                 IPS()
@@ -348,9 +488,7 @@ class OntologyManager(object):
 
             # this applies the custom callable to the actual data-argument
             # example: struct_wrapper = `atom_or_And`
-            res.data = struct_wrapper(arg)
-
-            return res
+            return OntoContainer(container_name, struct_wrapper(arg))
 
         return outer_func
 
@@ -449,10 +587,23 @@ class OntologyManager(object):
         self.normal_parse_functions[name] = func
 
     def cas_get(self, key, default=None):
-        return self.custom_attribute_store.get(key, default)
+        """
+        :param key:         tuple like (obj, <attribute_name_as_str>)
+        :param default:     returned if there is no such custom attribute
+        """
+        obj, attr_name = key
+        attr_dict = self.custom_attribute_store.get(obj)
+        if attr_dict is None:
+            return default
+        return attr_dict.get(attr_name, default)
 
     def cas_set(self, key, value):
-        self.custom_attribute_store[key] = value
+        """
+        :param key:         tuple like (obj, <attribute_name_as_str>)
+        :param value:
+        """
+        obj, attr_name = key
+        self.custom_attribute_store.setdefault(obj, {})[attr_name] = value
 
     # todo: this seems to be obsolete
     def resolve_name_accept_uqs(self, object_or_name: Yaml_Atom):
@@ -469,31 +620,64 @@ class OntologyManager(object):
         :return:
         """
 
-        if isinstance(object_or_name, (float, int)):
-            return object_or_name
-        elif isinstance(object_or_name, str) and self.quoted_string_re.match(object_or_name):
-            # quoted strings are not interpreted as names
-            # note that one pair of quotes is stripped away by the yaml-parser.
-            # to get a quoted string your yaml source code has to look like: `key: "'value'"`
+        # the yaml parser produces exact `str` instances -> check the most common case first (and fast)
+        if type(object_or_name) is str:
+            return self._resolve_str(object_or_name, accept_unquoted_strs)
+        elif isinstance(object_or_name, (float, int)):
             return object_or_name
         elif isinstance(object_or_name, str):
-
-            res, success = self._resolve_name(name=object_or_name)
-            if success:
-                return res
-
-            else:
-                if accept_unquoted_strs:
-                    return object_or_name
-                else:
-                    raise UnknownEntityError(f"unknown entity name: {object_or_name}")
+            return self._resolve_str(object_or_name, accept_unquoted_strs)
         else:
             msg = (
-                f"unexpected type ({type(object_or_name)}) of object <{object_or_name}>"
+                f"unexpected type ({type(object_or_name)}) of object <{object_or_name}> "
                 "in method resolve_name (expected str, int or float)"
             )
             raise TypeError(msg)
 
+    def _resolve_str(self, name: str, accept_unquoted_strs: bool):
+        """
+        Part of `resolve_name` for the case that `name` is known to be a string (saves the type dispatch).
+
+        :param name:
+        :param accept_unquoted_strs:    see `resolve_name`
+        :return:
+        """
+        cache_key = (name, accept_unquoted_strs)
+        res = self._resolve_cache.get(cache_key, _MISSING)
+        if res is not _MISSING:
+            return res
+
+        # cheaper than `self.quoted_string_re.match(name)` (and also accepts line breaks inside the quotes)
+        if len(name) >= 2 and name[0] in "\"'" and name[-1] == name[0]:
+            # quoted strings are not interpreted as names
+            # note that one pair of quotes is stripped away by the yaml-parser.
+            # to get a quoted string your yaml source code has to look like: `key: "'value'"`
+            res = name
+        else:
+            res, success = self._resolve_name(name=name)
+            if not success:
+                if accept_unquoted_strs:
+                    res = name
+                else:
+                    raise UnknownEntityError(f"unknown entity name: {name}")
+
+        self._resolve_cache[cache_key] = res
+        return res
+
+    def _invalidate_resolve_cache(self, name: str = None) -> None:
+        """
+        Remove the cached results of `resolve_name` for `name` (or all cached results if `name` is None).
+        This is called if `self.name_mapping` changes.
+
+        :param name:
+        :return:    None
+        """
+        if name is None:
+            self._resolve_cache.clear()
+        else:
+            self._resolve_cache.pop((name, True), None)
+            self._resolve_cache.pop((name, False), None)
+
     def _resolve_name(self, name: str) -> Tuple[Any, bool]:
         """
         Try to resolve `name` in the current namspace or in that of an imported ontology
@@ -508,6 +692,13 @@ class OntologyManager(object):
             res = self.name_mapping[name]
             success = True
         elif self.ns_compositum_re.match(name):
+            # fast path for the common case of short namespaces like "bfo:"
+            prefix, _, rest_name = name.partition(":")
+            imported_onto = self.imported_ontologies.get(f"{prefix}:")
+            if imported_onto is not None:
+                res = getattr(imported_onto, rest_name)
+                return res, res is not None
+
             ## !! #:marker01b: this is partially redundand with #:marker01a
             for ns, imported_onto in self.imported_ontologies.items():
                 if name.startswith(ns):
@@ -536,9 +727,17 @@ class OntologyManager(object):
         """
 
         assert len(data_dict) == 1
-        assert check_type(data_dict, Dict[str, dict])
+        assert check_dict_type(data_dict, str, dict)
+
+        individual_name, inner_dict = next(iter(data_dict.items()))
+        return self._make_individual(individual_name, inner_dict)
 
-        individual_name, inner_dict = list(data_dict.items())[0]
+    def _make_individual(self, individual_name: str, inner_dict: dict) -> owl2.Thing:
+        """
+        :param individual_name:
+        :param inner_dict:          dict like {"types": ["Class1"]} (is not changed)
+        :return:
+        """
         self.ensure_is_new_name(individual_name)
 
         types = self.process_tree({"types": inner_dict.get("types")}, squeeze=True)
@@ -564,19 +763,23 @@ class OntologyManager(object):
         """
 
         try:
-            names = data_dict.pop("names")
+            names = data_dict["names"]
         except KeyError:
             msg = f"Statement `owl_multiple_individuals` must have attribute `names`. {data_dict}"
             raise KeyError(msg)
 
+        # do not change data_dict (it might be part of raw_data which is reused)
+        inner_dict = {key: value for key, value in data_dict.items() if key != "names"}
+
+        # all individuals share the same (unchanged) inner dict -> no copies necessary
         for name in names:
-            self.make_individual_from_dict({name: dict(data_dict)})
+            self._make_individual(name, inner_dict)
 
     def make_class_from_dict(self, data_dict: dict) -> owl2.entity.ThingClass:
         assert len(data_dict) == 1
-        assert check_type(data_dict, Dict[str, dict])
+        assert check_dict_type(data_dict, str, dict)
 
-        class_name, inner_dict = list(data_dict.items())[0]
+        class_name, inner_dict = next(iter(data_dict.items()))
 
         processed_inner_dict = self.process_tree(inner_dict)
 
@@ -585,7 +788,7 @@ class OntologyManager(object):
         parent_class_list = ensure_list(parsed_subclass_expression)
 
 
-        check_type(parent_class_list, List[ScalarClassExpression])
+        _check_type(parent_class_list, List[ScalarClassExpression])
         assert len(parent_class_list) >= 1
 
         if isinstance(parent_class_list[0], owl2.ClassConstruct):
@@ -703,7 +906,7 @@ class OntologyManager(object):
         # create the main role for this RelationConcept
         main_role_name = f"X_has{concept_name[2:]}"
         main_role_domain_list = concept_data["X_associatedWithClasses"]
-        check_type(main_role_domain_list, List[Union[owl2.ThingClass, owl2.class_construct.ClassConstruct]])
+        assert check_list_type(main_role_domain_list, (owl2.ThingClass, owl2.class_construct.ClassConstruct))
 
         main_role = self.make_object_property_from_dict(
             {
@@ -735,7 +938,7 @@ class OntologyManager(object):
         for further_role_container in further_roles_list:
 
             len1dict = further_role_container.data
-            check_type(len1dict, Dict[owl2.PropertyClass, owl2.ThingClass])
+            _check_type(len1dict, Dict[owl2.PropertyClass, owl2.ThingClass])
             assert len(len1dict) == 1
 
             # further_role_object, further_role_range = list(len1dict.items())[0]
@@ -768,7 +971,7 @@ class OntologyManager(object):
         flag_value = str(flag_value)
         allowed_values = ["True", "recursive"]
         if flag_value not in allowed_values:
-            msg = f"For the flag {flag_key} only the following values are allowed: f{allowed_values}."
+            msg = f"For the flag {flag_key} only the following values are allowed: {allowed_values}."
             raise ValueError(msg)
         self.cas_set((new_class, flag_key), flag_value)
 
@@ -780,7 +983,7 @@ class OntologyManager(object):
         return proxy_individual
 
     def make_multiple_classes_from_list(self, dict_list: List[dict]) -> List[owl2.entity.ThingClass]:
-        check_type(dict_list, List[dict])
+        assert check_list_type(dict_list, dict)
         res = []
         for data_dict in dict_list:
             res.append(self.make_class_from_dict(data_dict))
@@ -798,15 +1001,15 @@ class OntologyManager(object):
         name, inner_dict = unpack_len1_mapping(data_dict)
 
         if not inner_dict.get("__content_is_parsed"):
-            # data_dict is raw (un-parsed)
+            # data_dict is raw (un-parsed); after parsing the values are wrapped in OntoContainers
             processed_inner_dict = self.process_tree(inner_dict)
-            range_ = ensure_list(processed_inner_dict["Range"].data)
-            domain = ensure_list(processed_inner_dict["Domain"].data)
+            range_ = processed_inner_dict["Range"].data
+            domain = processed_inner_dict["Domain"].data
         else:
             # the method was called from somewhere, where parsing already took place
             processed_inner_dict = inner_dict
-            range_ = ensure_list(processed_inner_dict["Range"])
-            domain = ensure_list(processed_inner_dict["Domain"])
+            range_ = processed_inner_dict["Range"]
+            domain = processed_inner_dict["Domain"]
 
         characteristics_container = processed_inner_dict.get("Characteristics")  # !! introduce walrus operator
         if characteristics_container:
@@ -814,7 +1017,8 @@ class OntologyManager(object):
         else:
             characteristics = []
 
-        kwargs = {"domain": domain, "range": range_}
+        # note: ensure_list does not copy lists
+        kwargs = {"domain": ensure_list(domain), "range": ensure_list(range_)}
         new_property = create_property(name, property_base_class, characteristics, kwargs)
         self.name_mapping[name] = new_property
         self.roles[name] = new_property
@@ -861,7 +1065,8 @@ class OntologyManager(object):
         domain = existing_inverse_property.range
         range_ = existing_inverse_property.domain
 
-        mro = existing_inverse_property.mro()
+        # set: several membership tests follow
+        mro = set(existing_inverse_property.mro())
         if owl2.ObjectProperty in mro:
             property_base_class = owl2.ObjectProperty
         elif owl2.DataProperty in mro:
@@ -906,28 +1111,33 @@ class OntologyManager(object):
         else:
             fact_data = []
 
+        # these do not change inside the loop (attribute access on owlready2 entities is not cheap)
+        is_object_property = isinstance(prop, owl2.ObjectPropertyClass)
+        is_functional_for = prop.is_functional_for
+        prop_name = prop.name
+
         for fact in fact_data:
             key, value = unpack_len1_mapping(fact)
 
             # check if all values have the right type
             for val in ensure_list(value):
-                if isinstance(prop, owl2.ObjectPropertyClass) and not is_generalized_thing(val):
+                if is_object_property and not is_generalized_thing(val):
                     msg = (
                         f"Unexpected type for property {prop}: `{val}` type: ({type(val)}). "
-                        f"Expected an instance of `owl:Thing` or  `<owl:Nothing>`. \n"
+                        f"Expected an instance of `owl:Thing` or `<owl:Nothing>`. \n"
                         f"Probable cause: unresolved key `{val}` or Concept instead of individual."
                     )
                     raise TypeError(msg)
 
-            if prop.is_functional_for(key):
+            if is_functional_for(key):
                 if isinstance(value, list):
                     msg = (
-                        f"While assigning range-value of functional property `{prop.name}`: Expected scalar "
+                        f"While assigning range-value of functional property `{prop_name}`: Expected scalar "
                         f"type from {prop.range} but instead got list: {value}"
                     )
                     raise TypeError(msg)
                 try:
-                    setattr(key, prop.name, value)
+                    setattr(key, prop_name, value)
                 except AttributeError as err:
                     # account for a (probable) bug in owlready2 related to inverse_property and owl:Nothing
                     # whose .__dict__ attribute is a `mapping_proxy` object which has no `.pop` method
@@ -938,7 +1148,7 @@ class OntologyManager(object):
                         self._handle_data_property_error(prop, value, err)
             else:
                 try:
-                    getattr(key, prop.name).extend(ensure_list(value))
+                    getattr(key, prop_name).extend(ensure_list(value))
                 except AttributeError as err:
                     self._handle_data_property_error(prop, value, err)
 
@@ -975,30 +1185,56 @@ class OntologyManager(object):
                 raise TypeError(msg)
             relation_concept = rc_prop.range[0]
 
-            check_type(inner_dict_list, List[Dict[owl2.PropertyClass, Union[Yaml_Atom, owl2.Thing]]])
+            # equivalent to check_type(inner_dict_list, List[Dict[owl2.PropertyClass, Union[Yaml_Atom, owl2.Thing]]])
+            # but much cheaper (no pydantic); omitted with `python -O`
+            assert check_list_type(inner_dict_list, dict)
+            assert all(
+                check_dict_type(inner_dict, owl2.PropertyClass, basic_types + (owl2.Thing,))
+                for inner_dict in inner_dict_list
+            )
             if len(inner_dict_list) == 0:
                 continue
 
+            # retrieve the value list only once (each attribute access queries the quadstore)
+            rc_list = getattr(indiv, rc_prop.name)
+
+            # resolve the property names only once (not for every relation concept individual)
+            prop_names = {prop: prop.name for inner_dict in inner_dict_list for prop in inner_dict}
+
             for inner_dict in inner_dict_list:
                 # for every new inner dict there must be a new relation concept.
                 # Each dict models a distinct relation
                 rc_indiv = self._create_new_relation_concept(relation_concept)
                 # equivalent to `dir_rule1.X_hasDocumentReference_RC.append(iX_DocumentReference_RC_0)
-                getattr(indiv, rc_prop.name).append(rc_indiv)
+                rc_list.append(rc_indiv)
 
                 for prop, value in inner_dict.items():
                     assert isinstance(value, basic_types + (owl2.Thing,))
+                    prop_name = prop_names[prop]
                     # equivalent to `iX_DocumentReference_RC_0.hasSection.append("§ 1.1")
-                    assert hasattr(rc_indiv, prop.name)
+                    # (the assert is omitted with `python -O`; then setattr/getattr would raise anyway)
+                    assert hasattr(rc_indiv, prop_name)
                     try:
-                        if prop.is_functional_for(value):
-                            setattr(rc_indiv, prop.name, value)
+                        if self._is_functional_property(prop) or prop.is_functional_for(value):
+                            setattr(rc_indiv, prop_name, value)
                         else:
                             # prop is not a functional
-                            getattr(rc_indiv, prop.name).append(value)
+                            getattr(rc_indiv, prop_name).append(value)
                     except AttributeError as err:
                         self._handle_data_property_error(prop, value, err)
 
+    def _is_functional_property(self, prop: owl2.PropertyClass) -> bool:
+        """
+        Return whether `prop` is declared as FunctionalProperty (the result is cached per property).
+
+        :param prop:
+        :return:    True or False
+        """
+        res = self._functional_property_cache.get(prop)
+        if res is None:
+            res = self._functional_property_cache[prop] = issubclass(prop, FunctionalProperty)
+        return res
+
     @staticmethod
     def _handle_data_property_error(prop: owl2.PropertyClass, value: Any, original_err: Exception):
         value = ensure_list(value)[0]
@@ -1020,10 +1256,11 @@ class OntologyManager(object):
         :return:
         """
         # generate name, create individual with role assignments
-        n = self.auto_generated_name_numbers[rc_type]
-        self.auto_generated_name_numbers[rc_type] += 1
+        # note: these individuals are named (not anonymous) because they are accessed by name (e.g. in the tests)
+        counter = self.auto_generated_name_numbers
+        n = counter[rc_type]
+        counter[rc_type] = n + 1
         relation_name = f"i{rc_type.name}_{n}"
-
         relation_individual = self._create_individual(relation_name, [rc_type])
 
         return relation_individual
@@ -1042,14 +1279,9 @@ class OntologyManager(object):
         """
 
         assert len(normal_dict) > 0
-        res = {}
-
-        for key, value in normal_dict.items():
-            key_entity = self.resolve_name(key)
-            parsed_value = parse_function(value)
-            res[key_entity] = parsed_value
 
-        return res
+        resolve_name = self.resolve_name
+        return {resolve_name(key): parse_function(value) for key, value in normal_dict.items()}
 
     def process_tree(
         self,
@@ -1071,12 +1303,14 @@ class OntologyManager(object):
 
         if parse_functions is None:
             parse_functions = self.normal_parse_functions
-        check_type(parse_functions, dict)
+        _check_type(parse_functions, dict)
 
         res = {}
         key = None
+        resolve_yaml_key = self._resolve_yaml_key
         for key, value in normal_dict.items():
-            key_func = self._resolve_yaml_key(parse_functions, key)
+            # get function or fail gracefully (with unified message)
+            key_func = resolve_yaml_key(parse_functions, key)
 
             try:
                 res[key] = key_func(value)
@@ -1091,20 +1325,32 @@ class OntologyManager(object):
         return res
 
     def different_individuals(self, data_list: list) -> None:
-        check_type(data_list, List[str])
+        assert check_list_type(data_list, str)
+
+        if "__all__" in data_list:
+            self.assert_all_different()
+            return
 
         individuals = []
         for elt in data_list:
-            if elt == "__all__":
-                individuals = list(self.onto.individuals())
-                break
-            else:
-                indiv = self.resolve_name(elt)
-                assert isinstance(indiv, owl2.Thing)
-                individuals.append(indiv)
+            indiv = self.resolve_name(elt)
+            assert isinstance(indiv, owl2.Thing)
+            individuals.append(indiv)
 
         owl2.AllDifferent(individuals)
 
+    def assert_all_different(self) -> owl2.AllDifferent:
+        """
+        Create an `AllDifferent`-axiom for all individuals of this ontology.
+
+        Note: `owl2.AllDifferent` needs the python objects of the individuals. These are not constructed anew here:
+        owlready2 returns the (already existing) objects from its entity cache.
+
+        :return:    the axiom object
+        """
+
+        return owl2.AllDifferent(list(self.onto.individuals()))
+
     def add_axiom_equivalent_to(self, data_dict: dict) -> None:
         """
          Create a equivalent to axiom after the creation of the class
@@ -1118,13 +1364,13 @@ class OntologyManager(object):
          """
 
         subject_name = self._resolve_yaml_key(data_dict, "Subject")
-        check_type(subject_name, str)
+        _check_type(subject_name, str)
         subject = self.resolve_name(subject_name)
 
         assert isinstance(subject, owl2.ThingClass)
 
         body = self._resolve_yaml_key(data_dict, "Body")
-        check_type(body, Union[dict, str, list])
+        _check_type(body, Union[dict, str, list])
 
         # evaluate the raw body-dict
         class_expression = self.parse_classexpression(body)
@@ -1144,13 +1390,13 @@ class OntologyManager(object):
         """
 
         subject_name = self._resolve_yaml_key(data_dict, "Subject")
-        check_type(subject_name, str)
+        _check_type(subject_name, str)
 
         # get the corresponding individual object
         subject = self.resolve_name(subject_name)
 
         body_dict = self._resolve_yaml_key(data_dict, "Body")
-        check_type(body_dict, dict)
+        _check_type(body_dict, dict)
 
         evaluated_restriction = self.property_restriction_parser.process_restriction_body(body_dict)
         self.add_restriction_to_entity(evaluated_restriction, subject)
@@ -1167,6 +1413,21 @@ class OntologyManager(object):
 
         indv.is_a.append(rstrn)
 
+    def add_restrictions_to_entities(self, pairs: List[Tuple[owl2.class_construct.Restriction, owl2.Thing]]) -> None:
+        """
+        Add several restrictions at once. The ontology context is entered only once for all pairs.
+
+        Note: owlready2 does not commit after each change of the quadstore (this happens only in `world.save()`).
+        Thus, all pairs already end up in one sqlite transaction; no explicit BEGIN/COMMIT is necessary.
+
+        :param pairs:   sequence of (restriction, entity)-tuples
+        :return:        None
+        """
+
+        with self.onto:
+            for rstrn, entity in pairs:
+                self.add_restriction_to_entity(rstrn, entity)
+
     def add_swrl_rule_from_dict(self, data_dict: Dict[str, str]) -> None:
         """
         Construct the swrl-rule-object (Semantic Web Rule Language) from the raw yaml data
@@ -1243,16 +1504,23 @@ class OntologyManager(object):
 
         self.onto.imported_ontologies.append(imported_onto)
 
+        # names which could not be resolved before might be resolvable now
+        self._invalidate_resolve_cache()
+
     def process_global_annotation(self, annotation_str: str) -> None:
-        check_type(annotation_str, str)
+        _check_type(annotation_str, str)
         self.onto.metadata.comment.append(annotation_str)
 
     # noinspection PyPep8Naming
     def _load_yaml(self, fpath):
-        with open(fpath, "r") as myfile:
-            self.raw_data = yaml.safe_load(myfile)
+        """
+        Load the yaml-file. If it contains multiple documents (separated by `---`) their lists are concatenated.
 
-        assert check_type(self.raw_data, List[dict])
+        :param fpath:
+        :return:        None
+        """
+        self.raw_data = load_yaml_file(fpath)
+        self._merged_raw_data = None
 
     def _get_from_all_dicts(self, key, default=None):
         """
@@ -1263,9 +1531,11 @@ class OntologyManager(object):
         :param default:
         :return:
         """
-        # src: https://stackoverflow.com/questions/9819602/union-of-dict-objects-in-python#comment23716639_12926008
-        all_dicts = dict(item for dct in self.raw_data for item in dct.items())
-        return all_dicts.get(key, default)
+        if self._merged_raw_data is None:
+            # the union is created only once (and reset if new raw data is loaded)
+            # src: https://stackoverflow.com/questions/9819602/union-of-dict-objects-in-python#comment23716639_12926008
+            self._merged_raw_data = dict(item for dct in self.raw_data for item in dct.items())
+        return self._merged_raw_data.get(key, default)
 
     @staticmethod
     def _resolve_yaml_key(data_dict, key):
@@ -1277,28 +1547,31 @@ class OntologyManager(object):
         :return:
         """
 
-        if key not in data_dict:
+        # only one dict lookup in the (common) success case
+        value = data_dict.get(key, _MISSING)
+        if value is _MISSING:
             msg = f"Key `{key}` not found in current part of in yaml-file: \ncomplete data:\n{data_dict}"
             raise KeyError(msg)
 
-        return data_dict[key]
+        return value
 
     def load_ontology(self):
 
         # provide namespace for classes via `with` statement
         res = []
+        top_level_parse_functions = self.top_level_parse_functions
         with self.onto:
 
             for top_level_dict in self.raw_data:
-                assert check_type(top_level_dict, Dict[str, Union[str, dict, list]])
+                assert check_dict_type(top_level_dict, str, (str, dict, list))
                 assert len(top_level_dict) == 1
-                key, inner_dict = list(top_level_dict.items())[0]
+                key, inner_dict = next(iter(top_level_dict.items()))
 
                 if key in self.excepted_non_function_keys:
                     continue
 
-                # get function or fail gracefully
-                tl_parse_function = self._resolve_yaml_key(self.top_level_parse_functions, key)
+                # get function or fail gracefully (with unified message)
+                tl_parse_function = self._resolve_yaml_key(top_level_parse_functions, key)
 
                 # now call the matching function
                 try:
@@ -1316,20 +1589,31 @@ class OntologyManager(object):
                 res.append(parsing_res)
 
         # shortcut for quick access to the name of the ontology
-        self.n = self.name_mapping_container = Container(self.name_mapping)
+        self.n = self.name_mapping_container = Container.from_dict(self.name_mapping)
 
-    def make_query(self, qsrc):
+    def make_query(self, qsrc, **bindings):
         """
         Wrapper around owlready2.query_owlready(...) which makes the result a set
 
-        :param qsrc:    query source
+        :param qsrc:        query source (parsed only once, see `_prepare_query`)
+        :param bindings:    optional values for variables of the query (without "?"), e.g. `part=n.dresden`;
+                            owlready2 entities are converted to their IRI
 
         :return:        set of results
         """
 
-        g = self.world.as_rdflib_graph()
+        if self._rdflib_graph is None:
+            # the graph is only a view on the quadstore of the world -> it can be reused for all queries
+            self._rdflib_graph = self.world.as_rdflib_graph()
 
-        r = g.query_owlready(qsrc)
+        # imported here: rdflib is only needed for queries (see also `_prepare_query`)
+        from rdflib import URIRef
+
+        # owlready2 entities (classes, individuals, properties) have an `.iri` attribute, rdflib terms do not
+        init_bindings = {key: URIRef(value.iri) if hasattr(value, "iri") else value for key, value in bindings.items()}
+        # like `Graph.query` with a query string: use the namespaces bound in the graph (rdf, rdfs, owl, xsd, ...)
+        query = _prepare_query(qsrc, tuple(self._rdflib_graph.namespaces()))
+        r = self._rdflib_graph.query_owlready(query, initBindings=init_bindings)
         res_list = []
         for elt in r:
             # ensure that here each element is a sequences of length 1
@@ -1339,8 +1623,38 @@ class OntologyManager(object):
         # drop duplicates
         return set(res_list)
 
-    def sync_reasoner(self, debug=False, **kwargs):
-        sync_reasoner_pellet(x=self.world, debug=debug, **kwargs)
+    def sync_reasoner(self, debug=False, backend="pellet", **kwargs):
+        """
+        Run the reasoner on the whole world.
+
+        :param debug:       debug flag (passed to the reasoner function)
+        :param backend:     name of one of the reasoners shipped with owlready2 (see `reasoner_backends`)
+        :param kwargs:      further keyword args (passed to the reasoner function)
+        :return:            None
+        """
+
+        try:
+            reasoner_function = reasoner_backends[backend]
+        except KeyError:
+            msg = f"Unknown reasoner backend: `{backend}`. Expected one of {list(reasoner_backends.keys())}."
+            raise ValueError(msg)
+
+        reasoner_function(x=self.world, debug=debug, **kwargs)
+
+
+@functools.lru_cache(maxsize=128)
+def _prepare_query(qsrc: str, namespaces: tuple):
+    """
+    Parse the sparql source only once (repeated queries, e.g. before and after running the reasoner, reuse it).
+
+    :param qsrc:        query source
+    :param namespaces:  tuple of (prefix, namespace)-pairs (tuple -> hashable cache key) which are known to the query
+    :return:            rdflib.plugins.sparql.sparql.Query object
+    """
+    # imported here: rdflib is only needed for queries (and importing it is not cheap)
+    from rdflib.plugins.sparql import prepareQuery
+
+    return prepareQuery(qsrc, initNs=dict(namespaces))
 
 
 def ensure_list(obj: Any, allow_tuple: bool = True) -> Union[list, tuple]:
@@ -1351,29 +1665,114 @@ def ensure_list(obj: Any, allow_tuple: bool = True) -> Union[list, tuple]:
     :param allow_tuple:
     :return:
     """
-    if isinstance(obj, list):
+    obj_type = type(obj)
+    # fast path for the most common cases
+    if obj_type is list:
         return obj
+    elif obj_type is tuple:
+        return obj if allow_tuple else list(obj)
 
-    elif allow_tuple and isinstance(obj, tuple):
+    # handle subclasses
+    if isinstance(obj, list):
         return obj
-    elif not allow_tuple and isinstance(obj, tuple):
-        return list(obj)
+    elif isinstance(obj, tuple):
+        return obj if allow_tuple else list(obj)
     else:
         return [obj]
 
 
-def check_type(obj, expected_type):
+# types which can be checked by isinstance (instead of pydantic)
+simple_types = (str, int, float, bool, dict, list, tuple)
+
+# strict pydantic types which can be checked by `type(obj) is ...` (note: StrictInt does not accept bool)
+strict_simple_types = {
+    pydantic.StrictInt: int,
+    pydantic.StrictFloat: float,
+    pydantic.StrictStr: str,
+    pydantic.StrictBool: bool,
+}
+
+
+def _never(obj) -> bool:
+    return False
+
+
+@functools.lru_cache(maxsize=None)
+def _get_simple_type_predicate(expected_type):
     """
-    Use the pydantic package to check for (complex) types from the typing module.
-    If type checking passes returns `True`. This allows to use `assert check_type(...)` which allows to omit those
-    type checks (together with other assertions) for performance reasons, e.g. with `python -O ...` .
+    Create a function which checks whether an object matches `expected_type` using only isinstance (only once per
+    type, i.e. `get_origin` and `get_args` are evaluated only here). Supported: the types in `simple_types` and
+    `strict_simple_types` and (nested) `List[...]`, `Dict[...]` and `Union[...]` of them. For all other types the
+    predicate returns False (which means "unknown").
 
+    :param expected_type:   primitive or complex type (like typing.List[str])
+    :return:                callable which takes the object and returns True or False
+    """
+
+    if expected_type in simple_types:
+        return lambda obj: isinstance(obj, expected_type)
+
+    strict_type = strict_simple_types.get(expected_type)
+    if strict_type is not None:
+        # subclasses (e.g. bool for int) are left to pydantic
+        return lambda obj: type(obj) is strict_type
+
+    origin = get_origin(expected_type)
+    if origin is Union:
+        predicates = tuple(_get_simple_type_predicate(arg) for arg in get_args(expected_type))
+        return lambda obj: any(predicate(obj) for predicate in predicates)
+    elif origin is list:
+        args = get_args(expected_type)
+        if len(args) != 1:
+            return _never
+        element_predicate = _get_simple_type_predicate(args[0])
+        if element_predicate is _never:
+            return _never
+        return lambda obj: isinstance(obj, list) and all(element_predicate(elt) for elt in obj)
+    elif origin is dict:
+        args = get_args(expected_type)
+        if len(args) != 2:
+            return _never
+        key_predicate, value_predicate = map(_get_simple_type_predicate, args)
+        if key_predicate is _never or value_predicate is _never:
+            return _never
+        return lambda obj: isinstance(obj, dict) and all(
+            key_predicate(key) and value_predicate(value) for key, value in obj.items()
+        )
+
+    return _never
+
+
+def _is_instance_of_simple_type(obj, expected_type) -> bool:
+    """
+    Check whether `obj` matches `expected_type` using only isinstance (see `_get_simple_type_predicate`).
 
     :param obj:             the object to check
+    :param expected_type:   primitive or complex type (like typing.List[str])
+    :return:                True or False
+    """
+
+    return _get_simple_type_predicate(expected_type)(obj)
+
+
+# pydantic >= 2 provides `TypeAdapter` which validates arbitrary types without creating a model class
+_TypeAdapter = getattr(pydantic, "TypeAdapter", None)
+
+
+@functools.lru_cache(maxsize=None)
+def _get_type_checker(expected_type):
+    """
+    Create the validation function for `check_type` (only once per type).
+
     :param expected_type:   primitive or complex type (like typing.List[dict])
-    :return:                True (or raise an TypeError)
+    :return:                callable which takes the object and raises pydantic.ValidationError if it does not match
     """
 
+    if _TypeAdapter is not None:
+        # arbitrary_types_allowed: necessary for types as Dict[str, owl2.Thing]
+        config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+        return _TypeAdapter(expected_type, config=config).validate_python
+
     class Model(pydantic.BaseModel):
         data: expected_type
 
@@ -1382,9 +1781,34 @@ def check_type(obj, expected_type):
             # otherwise check_type raises() an error for types as Dict[str, owl2.Thing]
             arbitrary_types_allowed = True
 
+    def checker(obj):
+        return Model(data=obj)
+
+    return checker
+
+
+def check_type(obj, expected_type):
+    """
+    Use the pydantic package to check for (complex) types from the typing module.
+    If type checking passes returns `True`. This allows to use `assert check_type(...)` which allows to omit those
+    type checks (together with other assertions) for performance reasons, e.g. with `python -O ...` .
+
+
+    :param obj:             the object to check
+    :param expected_type:   primitive or complex type (like typing.List[dict])
+    :return:                True (or raise an TypeError)
+    """
+
+    if _is_instance_of_simple_type(obj, expected_type):
+        # fast path (pydantic would accept obj as well)
+        return True
+
+    # complex type or obj does not match (pydantic might still accept it, e.g. an int for `float`)
+    checker = _get_type_checker(expected_type)
+
     # convert ValidationError to TypeError if the obj does not match the expected type
     try:
-        Model(data=obj)
+        checker(obj)
     except pydantic.ValidationError as ve:
         msg = (
             f"Unexpected type. Got: {type(obj)}. Expected: {expected_type}. "
@@ -1394,6 +1818,79 @@ def check_type(obj, expected_type):
 
     return True  # allow constructs like assert check_type(x, List[float])
 
+
+def _check_type_noop(obj, expected_type):
+    """
+    Replacement for `check_type` at the internal call sites if type checks are disabled.
+
+    :return:    True
+    """
+    return True
+
+
+# with `python -O ...` or the environment variable YPO_SKIP_TYPECHECK=1 the internal calls of `check_type` are skipped
+# (not only those inside `assert` statements); the public `check_type` always works
+if not __debug__ or os.environ.get("YPO_SKIP_TYPECHECK") == "1":
+    _check_type = _check_type_noop
+else:
+    _check_type = check_type
+
+
+def check_dict_type(obj, key_type, value_type):
+    """
+    Fast alternative to `check_type(obj, Dict[key_type, value_type])` for non-generic types (no typing constructs).
+    Like `check_type` it returns `True` to allow `assert check_dict_type(...)`.
+
+    :param obj:             the object to check
+    :param key_type:        type or tuple of types (like `isinstance`)
+    :param value_type:      type or tuple of types (like `isinstance`)
+    :return:                True (or raise an TypeError)
+    """
+
+    if not isinstance(obj, dict) or not all(
+        isinstance(key, key_type) and isinstance(value, value_type) for key, value in obj.items()
+    ):
+        msg = f"Unexpected type. Got: {type(obj)} ({obj}). Expected: dict with keys {key_type}, values {value_type}."
+        raise TypeError(msg)
+
+    return True
+
+
+def check_list_type(obj, element_type):
+    """
+    Fast alternative to `check_type(obj, List[element_type])` for non-generic types (no typing constructs).
+    Like `check_type` it returns `True` to allow `assert check_list_type(...)`.
+
+    :param obj:             the object to check
+    :param element_type:    type or tuple of types (like `isinstance`)
+    :return:                True (or raise an TypeError)
+    """
+
+    if not isinstance(obj, list) or not all(isinstance(elt, element_type) for elt in obj):
+        msg = f"Unexpected type. Got: {type(obj)} ({obj}). Expected: list of {element_type}."
+        raise TypeError(msg)
+
+    return True
+
+
+def load_yaml_file(fpath) -> list:
+    """
+    Load a yaml-file. If it contains multiple documents (separated by `---`) their lists are concatenated.
+
+    :param fpath:   path of the yaml-file
+    :return:        list of dicts
+    """
+    raw_data = []
+    # binary mode: the parser handles the decoding (and does not need a decoded copy of the file content)
+    with open(fpath, "rb") as myfile:
+        for document in yaml.load_all(myfile, Loader=yaml_loader):
+            if document is not None:
+                raw_data.extend(document)
+
+    assert check_list_type(raw_data, dict)
+    return raw_data
+
+
 def test_type(obj, expected_type):
     try:
         check_type(obj, expected_type)
@@ -1407,7 +1904,7 @@ def unpack_len1_mapping(data_dict: dict) -> tuple:
     assert isinstance(data_dict, dict)
     assert len(data_dict) == 1
 
-    return tuple(data_dict.items())[0]
+    return next(iter(data_dict.items()))
 
 
 def create_property(
@@ -1483,6 +1980,9 @@ class TreeParseFunction(object):
         self.start_ipdb = start_ipdb
         self.do_nothing = do_nothing
 
+        # bound method of the (still growing) dict of parse functions; saves the attribute lookups in every call
+        self._get_key_func = om.normal_parse_functions.get
+
 # !!TODO:  delete
     # def inner_element_func(self, obj):
     #     """
@@ -1523,8 +2023,13 @@ class TreeParseFunction(object):
             results = [self.inner_func(self.inner_element_func(elt)) for elt in arg]
         elif isinstance(arg, dict):
             results = []
+            # local name saves the attribute lookups in every iteration
+            get_key_func = self._get_key_func
             for key, value in arg.items():
-                key_func = self.om.normal_parse_functions.get(key)
+                key_func = get_key_func(key)
+                if key_func is None:
+                    msg = f"unknown key `{key}` in TreeParseFunction {self.name} (processing {arg})."
+                    raise UnknownEntityError(msg)
                 results.append(key_func(value))
         elif isinstance(arg, str):
             if self.ensure_list_flag:
@@ -1555,13 +2060,12 @@ class PropertyRestrictionParser(object):
         """
 
         self.om = om
-        self.objects = None
-        self.restriction_type_names = None
         self.valid_restriction_types = (Lit.value, Lit.some)
 
     def process_restriction_body(self, data_dict: dict) -> owl2.class_construct.Restriction:
         """
         Convert a raw yaml dict to a restriction object (like `lives_in.some(has_color.value(red)`).
+        Recursive function (nested restrictions are processed by `_process_role_value_dict`).
 
         :param data_dict:
 
@@ -1575,57 +2079,14 @@ class PropertyRestrictionParser(object):
         :return: restriction object
         """
 
-        # this fills `self.objects` and `self.restriction_type_names`
-        self.parse_dict_to_lists(data_dict, init=True)
-
-        final_value = self.objects.pop()
-        self.objects.reverse()
-        self.restriction_type_names.reverse()
-
-        assert len(self.objects) == len(self.restriction_type_names)
-
-        arg = final_value  # initialize with the last value (e.g. `red`)
-        for restriction_type_name, role_object in zip(self.restriction_type_names, self.objects):
-            # produce something like `has_color.value(red)`
-            assert restriction_type_name in self.valid_restriction_types
-            restriction = getattr(role_object, restriction_type_name)
-            arg = restriction(arg)
-
-        evaluated_restriction = arg
-        return evaluated_restriction
-
-    def parse_dict_to_lists(self, data_dict: dict, init: bool = False) -> None:
-        """
-        Recursive function
-
-        :param init:
-        :param data_dict:
-
-        input data example:
-            {'lives_in': {'some': {'has_color': {'value': 'red'}} }}
-
-        should finally be converted in a call:
-
-            lives_in.some(has_color.value(red)
-        Here we do the preparation.
-
-        :return:    list of objects and list of restriction_type_names
-        """
-
-        if init:
-            self.objects = []  # hold the actual role-objects and the final argument
-            self.restriction_type_names = []  # holds something like "some" or "value"
-
         key, value = self._unpack_dict(data_dict)
 
         if key in self.om.roles:
-            self.objects.append(self.om.roles[key])
-            self._process_role_value_dict(key, value)
+            return self._process_role_value_dict(self.om.roles[key], key, value)
 
         elif key == "SubClassOf":
             # todo: !! unittest
-            parsed_subclass_expression = self.om.parse_classexpression(value)
-            self.objects.append(parsed_subclass_expression)
+            return self.om.parse_classexpression(value)
 
         elif key == "Inverse":
             # assumed situation (example for data_dict):
@@ -1637,28 +2098,27 @@ class PropertyRestrictionParser(object):
                 msg = f"A role name is expected after `Inverse:`. Instead got {inner_key}."
                 raise ValueError(msg)
 
-            # ensure that the final call is `Inverse(drinks).some(...)`
-            self.objects.append(owl2.Inverse(role))
-
             # Assumption for inner_value:
             # {'some': {'lives_in': {'some': {'has_color': {'value': 'green'}}}}}
             assert isinstance(inner_value, dict)
-            self._process_role_value_dict(key, inner_value)
+
+            # ensure that the final call is `Inverse(drinks).some(...)`
+            return self._process_role_value_dict(owl2.Inverse(role), key, inner_value)
 
         else:
             msg = f"Unknown key: {key}. Expected role name."
             raise ValueError(msg)
 
-        assert len(self.objects) == len(self.restriction_type_names) + 1
-        # return self.objects, self.restriction_type_names
-
-    def _process_role_value_dict(self, role_name: str, value_dict: dict) -> None:
+    def _process_role_value_dict(
+        self, role_object, role_name: str, value_dict: dict
+    ) -> owl2.class_construct.Restriction:
         """
 
+        :param role_object: the role (or an `Inverse(...)`-construct) to which the restriction refers
         :param role_name:   str; only need for error messages
-        :param value_dict:  the dict which should be parsed
+        :param value_dict:  the dict which should be parsed (like {'value': 'red'})
 
-        :return:    None (but extends `self.objects` etc.)
+        :return:    restriction object (like `has_color.value(red)`)
         """
         assert isinstance(value_dict, dict)
         inner_key, inner_value = self._unpack_dict(value_dict)
@@ -1667,33 +2127,30 @@ class PropertyRestrictionParser(object):
             restriction_type = self.om.restriction_types[inner_key]
         except KeyError:
             msg = (
-                f"Malformed restriction: role name {role_name} must be followed by"
+                f"Malformed restriction: role name {role_name} must be followed by "
                 f"restriction type like `some`. Instead got {inner_key}"
             )
             raise ValueError(msg)
-        self.restriction_type_names.append(restriction_type)
-
-        if restriction_type in self.valid_restriction_types:
-            assert isinstance(inner_value, (dict, str, int, float))
-            if isinstance(inner_value, str):
-                final_value = self.om.resolve_name(inner_value, accept_unquoted_strs=True)
-                self.objects.append(final_value)
-            elif isinstance(inner_value, (int, float)):
-                # handle numbers
-                final_value = inner_value
-                self.objects.append(final_value)
-            else:
-                # example for assumed situation: {'some': {'has_color': {'value': 'red'}} }
-                # -> inner_value  = {'has_color': {'value': 'red'}}
-                # different example (total body-dict):
-                assert isinstance(inner_value, dict)
-                assert restriction_type == Lit.some
-                self.parse_dict_to_lists(inner_value)
 
-        else:
+        if restriction_type not in self.valid_restriction_types:
             msg = f"Unknown restriction_type: {restriction_type}"
             raise ValueError(msg)
 
+        assert isinstance(inner_value, (dict, str, int, float))
+        if isinstance(inner_value, str):
+            arg = self.om.resolve_name(inner_value, accept_unquoted_strs=True)
+        elif isinstance(inner_value, (int, float)):
+            # handle numbers
+            arg = inner_value
+        else:
+            # example for assumed situation: {'some': {'has_color': {'value': 'red'}} }
+            # -> inner_value  = {'has_color': {'value': 'red'}}
+            assert restriction_type == Lit.some
+            arg = self.process_restriction_body(inner_value)
+
+        # produce something like `has_color.value(red)`
+        return getattr(role_object, restriction_type)(arg)
+
     @staticmethod
     def _unpack_dict(data_dict):
         """
@@ -1703,8 +2160,10 @@ class PropertyRestrictionParser(object):
         """
         assert len(data_dict) == 1
 
-        key, value = tuple(data_dict.items())[0]
-        check_type(key, str)
-        check_type(value, Union[dict, str, int, float])
+        key, value = next(iter(data_dict.items()))
+        if __debug__:
+            # this is called on every level of a restriction body -> omit these checks with `python -O`
+            _check_type(key, str)
+            _check_type(value, Union[dict, str, int, float])
 
         return key, value
@@ -1,6 +1,10 @@
 from collections import defaultdict
 
+import os
 import re
+import pickle
+import hashlib
+import functools
 import yaml
 import pydantic
 from typing import Union, List, Dict, Callable
@@ -22,6 +26,8 @@ from owlready2 import (
 # noinspection PyUnresolvedReferences
 from ipydex import IPS, activate_ips_on_exception
 
+from .core import ensure_list
+
 activate_ips_on_exception()
 
 
@@ -32,6 +38,15 @@ def render_using_label(entity):
 
 set_render_func(render_using_label)
 
+# use the (much faster) C-implementation of the parser (libyaml) if available
+yaml_loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# sentinel to distinguish "not found" from stored None-values
+_MISSING = object()
+
+# compiled only once (not for every Ontology instance)
+quoted_string_re = re.compile("(^\".*\"$)|(^'.*'$)")
+
 
 class Container(object):
     def __init__(self, arg=None, **data_dict):
@@ -41,11 +56,13 @@ class Container(object):
 
 
 class Ontology(object):
-    def __init__(self, fpath, world=None):
+    def __init__(self, fpath, world=None, yaml_cache_dir=None):
         """
 
-        :param fpath:   path of the yaml-file containing the ontology
-        :param world:   owl2 world object holding all the RDF-data (default: None)
+        :param fpath:           path of the yaml-file containing the ontology
+        :param world:           owl2 world object holding all the RDF-data (default: None)
+        :param yaml_cache_dir:  optional directory where the parsed yaml data is cached (as pickle file, keyed by the
+                                hash of the file content); default: None (no caching)
         """
         if world is None:
             world = owl2.default_world
@@ -62,16 +79,30 @@ class Ontology(object):
         self._RelationConcept = None
         self._RelationConcept_generic_main_role = None  # all other RC_main_roles will be a subclass of this
         self.relation_concept_main_roles = []  # list of all subclasses of self._Relation_Concept
+        self.relation_concept_main_roles_set = set()  # same content (for fast membership tests)
         self.auto_generated_name_numbers = defaultdict(lambda: 0)
 
         # we cannot store arbitrary python attributes in owl-objects directly, hence we use this dict
         # keys will be tuples of the form: (obj, <attribute_name_as_str>)
         self.custom_attribute_store = {}
 
+        # {<property>: <bool>} whether str is in the range of the property (see `_handle_key_for_individual`)
+        self._str_in_range_cache = {}
+
         # will be a Container later
         self.n = None
-        self.quoted_string_re = re.compile("(^\".*\"$)|(^'.*'$)")
+        self.quoted_string_re = quoted_string_re
+
+        # type of a yaml value -> method which resolves the names in it (see `get_named_object`)
+        self._value_resolvers = {
+            dict: self._resolve_dict,
+            list: self._resolve_list,
+            str: self.resolve_name,
+            int: self.resolve_name,
+            float: self.resolve_name,
+        }
 
+        self.yaml_cache_dir = yaml_cache_dir
         self._load_yaml(fpath)
 
         # extract the internationalized ressource identifier or use default
@@ -115,11 +146,8 @@ class Ontology(object):
         :param accept_unquoted_strs:
         """
 
-        res = []
-        for elt in seq:
-            res.append(self.resolve_name(elt, accept_unquoted_strs))
-
-        return res
+        resolve_name = self.resolve_name
+        return [resolve_name(elt, accept_unquoted_strs) for elt in seq]
 
     def get_named_object(self, data_dict, key_name, accept_unquoted_strs=False):
         """
@@ -147,6 +175,11 @@ class Ontology(object):
 
         # `data_dict[key_name]` could be a single value or a list or a dict
         raw_value = data_dict[key_name]
+        resolver = self._value_resolvers.get(type(raw_value))
+        if resolver is not None:
+            return resolver(raw_value, accept_unquoted_strs)
+
+        # subclasses of dict or list (rare)
         if isinstance(raw_value, dict):
             return self._resolve_dict(raw_value, accept_unquoted_strs)
         elif isinstance(raw_value, list):
@@ -155,8 +188,10 @@ class Ontology(object):
             return self.resolve_name(raw_value, accept_unquoted_strs)
 
     def _resolve_dict(self, data, accept_unquoted_strs=False):
-        assert len(data) == 1
-        key, value = list(data.items())[0]
+        if len(data) != 1:
+            msg = f"Expected a dict with exactly one key but got: {data}"
+            raise ValueError(msg)
+        key = next(iter(data))
         key_obj = self.resolve_name(key)
         assert check_type(key_obj, Callable)
 
@@ -179,20 +214,22 @@ class Ontology(object):
         :return:
         """
 
-        # assume elt is a string
-        if isinstance(object_name, (float, int)):
-            return object_name
-        elif isinstance(object_name, str) and self.quoted_string_re.match(object_name):
-            # quoted strings are not interpreted as names
+        if isinstance(object_name, str):
+            # most common case: a known name (one dict lookup)
+            res = self.name_mapping.get(object_name, _MISSING)
+            if res is not _MISSING:
+                return res
+
+            if self.quoted_string_re.match(object_name):
+                # quoted strings are not interpreted as names
+                return object_name
+        elif isinstance(object_name, (float, int)):
             return object_name
 
-        elif isinstance(object_name, str) and object_name in self.name_mapping:
-            return self.name_mapping[object_name]
+        if accept_unquoted_strs:
+            return object_name
         else:
-            if accept_unquoted_strs:
-                return object_name
-            else:
-                raise ValueError(f"unknown name (or type): {object_name}")
+            raise ValueError(f"unknown name (or type): {object_name}")
 
     def ensure_is_known_name(self, name):
         if name not in self.name_mapping:
@@ -208,43 +245,44 @@ class Ontology(object):
     def make_individual(self, i_name, data_dict):
 
         kwargs = {}
-        label = []
-        name = None
 
         # store relation-concept-role-data and process it after the creation of the individual
         relation_concept_role_mappings = {}
-        swrl_rules = []
 
         is_a_type = self.get_named_object(data_dict, "isA")
-        for key, value in data_dict.items():
-            if key == "isA":
-                continue
-            if key == "name":
-                name = data_dict[key]
-            elif key == "label":
-                label_object = ensure_list(data_dict[key])
-                label.extend(label_object)
-                if any(not isinstance(elt, str) for elt in label):
-                    msg = (
-                        f"Invalid type ({type(label_object)}) for label of individual '{i_name}'."
-                        f"Expected str or list of str."
-                    )
-                    raise TypeError(msg)
-            elif key == "X_swrl_rules":
-                swrl_rules.append(value)
-
-            else:
-
-                res = self._handle_key_for_individual(key, value, i_name, relation_concept_role_mappings)
-                if res is None:
-                    continue
-                else:
-                    assert isinstance(res, dict)
-                    kwargs.update(res)
 
+        # handle the special keys once (on a copy, the raw data remains unchanged)
+        # -> the loop below only sees property keys
+        data_dict = dict(data_dict)
+        data_dict.pop("isA", None)
+        name = data_dict.pop("name", None)
         if name is None:
             name = i_name
 
+        label = []
+        if "label" in data_dict:
+            label_object = ensure_list(data_dict.pop("label"))
+            label.extend(label_object)
+            if any(not isinstance(elt, str) for elt in label):
+                msg = (
+                    f"Invalid type ({type(label_object)}) for label of individual '{i_name}'."
+                    f"Expected str or list of str."
+                )
+                raise TypeError(msg)
+
+        swrl_rules = []
+        if "X_swrl_rules" in data_dict:
+            swrl_rules.append(data_dict.pop("X_swrl_rules"))
+
+        handle_key_for_individual = self._handle_key_for_individual
+        for key, value in data_dict.items():
+            res = handle_key_for_individual(key, value, i_name, relation_concept_role_mappings)
+            if res is None:
+                continue
+            else:
+                assert isinstance(res, dict)
+                kwargs.update(res)
+
         new_individual = self._create_individual(is_a_type, name, i_name, label, kwargs)
 
         self._handle_relation_concept_roles(new_individual, relation_concept_role_mappings)
@@ -275,9 +313,11 @@ class Ontology(object):
             value_object = self.name_mapping.get(value)
         else:
             value_object = None
-        accept_unquoted_strs = str in property_object.range
+        accept_unquoted_strs = self._str_in_range_cache.get(property_object)
+        if accept_unquoted_strs is None:
+            accept_unquoted_strs = self._str_in_range_cache[property_object] = str in property_object.range
 
-        if property_object in self.relation_concept_main_roles:
+        if property_object in self.relation_concept_main_roles_set:
             if relation_concept_role_mappings is not None:
                 # save the relevant information for later processing. value is still a unparsed
                 relation_concept_role_mappings[property_object] = value
@@ -343,7 +383,7 @@ class Ontology(object):
             assert len(rc_role.range) == 1  # currently not clear what to do otherwise
             relation_concept = rc_role.range[0]
 
-            check_type(data, Union[dict, List[dict]])
+            assert check_type(data, Union[dict, List[dict]])
             data = ensure_list(data)
 
             for data_dict in data:
@@ -436,6 +476,7 @@ class Ontology(object):
         main_role.is_a.append(self._RelationConcept_generic_main_role)
 
         self.relation_concept_main_roles.append(main_role)
+        self.relation_concept_main_roles_set.add(main_role)
 
         # create furhter roles
         further_roles_dict = concept_data.get("X_associatedRoles")
@@ -516,13 +557,13 @@ class Ontology(object):
 
         if cgi is None:
             # look at the parent classes (could be more than one)
-            cgi_flags = []
-            for parent_class in parent_classes:
-                cgi_flags.append(self.cas_get(key=(parent_class, "X_createGenericIndividual"), default=False))
+            # direct dict access (instead of calling `self.cas_get` for every parent class)
+            cas = self.custom_attribute_store
+            cgi_flags = [cas.get((parent_class, "X_createGenericIndividual"), False) for parent_class in parent_classes]
 
             # check for inconsistency
             assert len(cgi_flags) > 0
-            if not cgi_flags.count(cgi_flags[0]) == len(cgi_flags):
+            if len(set(cgi_flags)) > 1:
                 msg = (
                     f"Inconsistency found wrt the createGenericIndividual Option deduced from the following "
                     f"parent classes: {parent_classes} ({cgi_flags})"
@@ -593,6 +634,7 @@ class Ontology(object):
             additional_properties = []
 
         new_role = type(name, (PropertyBaseClass, *additional_properties), kwargs)
+        self._str_in_range_cache[new_role] = str in mapsTo
         self.name_mapping[name] = new_role
         self.new_classes.append(new_role)
         self.roles.append(new_role)
@@ -642,20 +684,27 @@ class Ontology(object):
          :param data:
          :return:
         """
+        name_mapping = self.name_mapping
+        handle_relation_concept_roles = self._handle_relation_concept_roles
         for individual_name, further_role_data in data.items():
-            individual = self.name_mapping[individual_name]
+            individual = name_mapping[individual_name]
 
             # further_role_data might be a dict (like in the case of bamberg) or a list of dicts
             # (like in the case of munich), see docstring
             # -> ensure list
-            ensure_list(further_role_data)
+            further_role_data = ensure_list(further_role_data)
+            if not all(isinstance(elt, dict) for elt in further_role_data):
+                msg = (
+                    f"Unexpected data for relation concept stipulation `{role.name}` of `{individual_name}`: "
+                    f"{further_role_data}. Expected dict or list of dicts."
+                )
+                raise TypeError(msg)
 
             for further_role_dict in further_role_data:
-                assert isinstance(further_role_dict, dict)
                 # create a data structure which is like the one when creating individuals
                 rcr_mapping = {role: further_role_dict}
 
-                self._handle_relation_concept_roles(individual, rcr_mapping)
+                handle_relation_concept_roles(individual, rcr_mapping)
 
     def _process_ordinary_stipulation(self, role_name, data):
         """
@@ -673,10 +722,13 @@ class Ontology(object):
         :return:
         """
 
+        name_mapping = self.name_mapping
+        ensure_is_known_name = self.ensure_is_known_name
+        get_objects_from_sequence = self.get_objects_from_sequence
         for ind_name, seq in data.items():
-            self.ensure_is_known_name(ind_name)
-            individual = self.name_mapping[ind_name]
-            ind_seq = self.get_objects_from_sequence(seq)
+            ensure_is_known_name(ind_name)
+            individual = name_mapping[ind_name]
+            ind_seq = get_objects_from_sequence(seq)
 
             # apply this role to the individual
             getattr(individual, role_name).extend(ind_seq)
@@ -707,8 +759,28 @@ class Ontology(object):
 
     # noinspection PyPep8Naming
     def _load_yaml(self, fpath):
-        with open(fpath, "r") as myfile:
-            self.raw_data = yaml.safe_load(myfile)
+        # binary mode: the parser handles the decoding
+        with open(fpath, "rb") as myfile:
+            content = myfile.read()
+
+        if self.yaml_cache_dir is None:
+            self.raw_data = yaml.load(content, Loader=yaml_loader)
+            return
+
+        cache_path = os.path.join(self.yaml_cache_dir, f"{hashlib.blake2b(content).hexdigest()}.pkl")
+        if os.path.isfile(cache_path):
+            with open(cache_path, "rb") as cache_file:
+                self.raw_data = pickle.load(cache_file)
+            return
+
+        self.raw_data = yaml.load(content, Loader=yaml_loader)
+
+        # write to a temporary file first -> other processes never see an incomplete cache file
+        os.makedirs(self.yaml_cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as cache_file:
+            pickle.dump(self.raw_data, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
 
     def load_ontology(self):
 
@@ -761,23 +833,19 @@ class Ontology(object):
         sync_reasoner_pellet(x=self.world, **kwargs)
 
 
-def ensure_list(obj, allow_tuple=True):
+@functools.lru_cache(maxsize=None)
+def _get_type_check_model(expected_type):
     """
-    return [obj] if obj is not already a list (or optionally tuple)
+    Create the pydantic model for `check_type` (only once per type).
 
-    :param obj:
-    :param allow_tuple:
-    :return:
+    :param expected_type:   primitive or complex type (like typing.List[dict])
+    :return:                model class with one field `data`
     """
-    if isinstance(obj, list):
-        return obj
 
-    elif allow_tuple and isinstance(obj, tuple):
-        return obj
-    elif not allow_tuple and isinstance(obj, tuple):
-        return list(obj)
-    else:
-        return [obj]
+    class Model(pydantic.BaseModel):
+        data: expected_type
+
+    return Model
 
 
 def check_type(obj, expected_type):
@@ -792,8 +860,11 @@ def check_type(obj, expected_type):
     :return:                True (or raise an TypeError)
     """
 
-    class Model(pydantic.BaseModel):
-        data: expected_type
+    if not __debug__:
+        # `python -O ...`: skip also the calls which are not part of an assert statement
+        return True
+
+    Model = _get_type_check_model(expected_type)
 
     # convert ValidationError to TypeError if the obj does not match the expected type
     try: